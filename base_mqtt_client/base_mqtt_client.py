@@ -27,8 +27,8 @@ import logging
 import logging.handlers
 import os
 import sys
+import threading
 import time
-from paho.mqtt import client as mqtt_client
 from base_mqtt_client import ha_discover as HA
 
 #
@@ -61,6 +61,9 @@ class BaseMqttClient: #pylint: ...disable=too-many-instance-attributes
         self.topic_root = None  # Root path for all topics
         self.unpublished = True  # set to true if the topics are not published yet
         self.client = None  # mqtt client
+        self.connected = threading.Event()  # set when the broker acknowledged the connection
+        self.publish_lock = threading.Lock()  # protects connected state and pending messages
+        self.pending = {}  # last payload per topic, published directly after connect
 
         # broker config:
         self.broker = None
@@ -187,6 +190,12 @@ class BaseMqttClient: #pylint: ...disable=too-many-instance-attributes
     def read_client_config( self, config):
         """This method can be overwritten to read more config data from ini file"""
 
+    def warm_up(self):
+        """
+        This method can be overwritten to prepare sensors before connect. It is
+        called by connect() before the connection to the broker is started.
+        """
+
     @classmethod
     def on_connect(cls, client, inst, flags, rc, properties): #pylint: disable=too-many-arguments,too-many-positional-arguments,unused-argument
         """Method called on connect to broker"""
@@ -194,13 +203,32 @@ class BaseMqttClient: #pylint: ...disable=too-many-instance-attributes
             inst.log.info("Connected to MQTT Broker!")
             # make the subscritions at the broker
             inst.subscribe()
+            # publish everything which was queued while connecting. The lock
+            # keeps newer payloads from being sent before the queued ones
+            with inst.publish_lock:
+                for topic, (payload, retain) in inst.pending.items():
+                    client.publish(topic, payload, retain=retain)
+                inst.pending = {}
+                inst.connected.set()
         else:
             inst.log.warning("Failed to connect, return code %s", rc)
 
+    @classmethod
+    def on_connect_fail(cls, client, inst): #pylint: disable=unused-argument
+        """Method called if the connection to the broker could not be established"""
+        inst.log.warning(
+            "Error while connect to server %s:%s. Retry in %s seconds...",
+            inst.broker,
+            inst.port,
+            inst.reconnect_delay,
+        )
+
     @classmethod
     def on_disconnect(cls, client, inst, flags, rc, properties): #pylint: disable=too-many-arguments,too-many-positional-arguments,unused-argument
         """Method called on disconnect from broker"""
         inst.log.info("Disconnected with result code: %s", rc)
+        with inst.publish_lock:
+            inst.connected.clear()
         inst.unpublished = True
         inst.brightness = -1
         while True:
@@ -253,34 +281,43 @@ class BaseMqttClient: #pylint: ...disable=too-many-instance-attributes
         else:
             inst.log.info("Wrong topic syntax received from broker %s", msg.topic)
 
-    def connect(self) -> mqtt_client:
+    def connect(self):
         """
-        Method to connect to the mqtt broker
+        Method to connect to the mqtt broker. The connection is established in
+        the background, messages published before are sent after connect.
         """
+        # prepare sensors while connecting
+        self.warm_up()
+
+        from paho.mqtt import client as mqtt_client  # pylint: disable=import-outside-toplevel
+
         self.client = mqtt_client.Client(mqtt_client.CallbackAPIVersion.VERSION2)
         if self.username != "":
             self.client.username_pw_set(self.username, self.password)
         self.client.on_connect = BaseMqttClient.on_connect
+        self.client.on_connect_fail = BaseMqttClient.on_connect_fail
         self.client.on_disconnect = BaseMqttClient.on_disconnect
-        while True:
-            try:
-                self.client.connect(self.broker, self.port)
-            except OSError as error:
-                self.log.warning(
-                    "Error while connect to server %s:%s: %s",
-                    self.broker,
-                    self.port,
-                    error,
-                )
-                time.sleep(self.reconnect_delay)
-                continue
-            break
+        self.client.reconnect_delay_set(self.reconnect_delay, self.reconnect_delay)
         # set user data for call backs
         self.client.user_data_set(self)
 
-        # start main loop of mqtt client
+        # start main loop of mqtt client, it connects to the broker and retries on errors
+        self.client.connect_async(self.broker, self.port)
         self.client.loop_start()
 
+    def publish(self, topic, payload, retain=False):
+        """
+        Publish payload to topic. If the broker has not acknowledged the
+        connection yet, the last payload per topic is queued and published
+        directly after connect. Returns the status of the publish (0 = success).
+        """
+        with self.publish_lock:
+            if not self.connected.is_set():
+                self.pending[topic] = (payload, retain)
+                return 0
+            result = self.client.publish(topic, payload, retain=retain)
+        return result[0]
+
     def subscribe(self):
         """
         method to subscribe to all the configured topics at the broker
@@ -297,11 +334,10 @@ class BaseMqttClient: #pylint: ...disable=too-many-instance-attributes
         """Publish ha discovery topics"""
         if self.ha_dc is True:
             # publish new entity
-            result = self.client.publish(topic, payload, retain=True)
+            status = self.publish(topic, payload, retain=True)
         else:
             # delete entity
-            result = self.client.publish(topic, "", retain=True)
-        status = result[0]
+            status = self.publish(topic, "", retain=True)
         if status == 0:
             self.log.debug("Send '%s' to topic %s", payload, topic)
         else:
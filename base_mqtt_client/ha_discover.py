@@ -45,18 +45,25 @@ class HADiscovery:
         model="MyModel",
     ):
         """Create class default values"""
-        if os.path.isfile(UUID_FILE):
-            with open(UUID_FILE, "r", encoding="utf-8") as f:
-                self.uid = str(f.read()).strip()
-        else:
-            self.uid = "_" + str(hex(uuid.getnode())).replace("0x", "") + "_"
-            with open(UUID_FILE, "w", encoding="utf-8") as f:
-                f.write(self.uid)
+        self._uid = None
         self.device_name = device_name
         self.base = base
         self.manufacturer = manufacturer
         self.model = model
 
+    @property
+    def uid(self):
+        """uid of the device, read from the uuid file on first use"""
+        if self._uid is None:
+            if os.path.isfile(UUID_FILE):
+                with open(UUID_FILE, "r", encoding="utf-8") as f:
+                    self._uid = str(f.read()).strip()
+            else:
+                self._uid = "_" + str(hex(uuid.getnode())).replace("0x", "") + "_"
+                with open(UUID_FILE, "w", encoding="utf-8") as f:
+                    f.write(self._uid)
+        return self._uid
+
     def device(self):
         """json content of a device"""
         js = {}
@@ -93,6 +100,32 @@ class HADiscovery:
         js["device"] = self.device()
         return topic, json.dumps(js)
 
+    def binary_sensor( # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        name,
+        state_topic,
+        value_template=None,
+        device_class=None,
+        icon=None
+    ):
+        """json content of a binary sensor"""
+        uid = self.uid
+        topic = self.base + "/binary_sensor/" + uid + "/" + name.replace(" ", "_") + "/config"
+        js = {}
+        js["name"] = name
+        js["unique_id"] = self.uid + "_" + name.replace(" ", "_")
+        js["state_topic"] = state_topic
+        js["payload_on"] = "ON"
+        js["payload_off"] = "OFF"
+        if value_template is not None:
+            js["value_template"] = "{{ value_json." + value_template + " }}"
+        if device_class is not None:
+            js["device_class"] = device_class
+        if icon is not None:
+            js['icon'] = "mdi:"+icon
+        js["device"] = self.device()
+        return topic, json.dumps(js)
+
     def switch(self, name, state_topic, value_template=None):
         """json content of a switch"""
         uid = self.uid
@@ -24,13 +24,85 @@ Module implements a MQTT client for FullPageOS
 
 import signal
 import sys
-import smbus
+import time
 from base_mqtt_client import base_mqtt_client as BMC
 
 #
 # global constants
 #
 CONFIG_FILE = "mqttBH1750Client.ini"  # name of the ini file
+I2C_BUS = 1  # i2c bus of the raspberry pi
+MEASUREMENT_TIME = 0.18  # max. measurement time of the bh1750 in high resolution modes
+MEASUREMENT_TIME_LOW_RES = 0.024  # max. measurement time of the bh1750 in low resolution modes
+LOW_RES_MODES = (0x13, 0x23)  # continuous and one time low resolution mode
+EVENT_ICONS = {  # icons of the light event types in home assistant
+    "below": "weather-night",
+    "above": "white-balance-sunny",
+    "falling": "trending-down",
+    "rising": "trending-up",
+}
+
+#
+# helper classes
+#
+class LuxEvent:
+    """
+    Implements a light change trigger on the lux sample stream.
+    Types 'below' and 'above' compare the lux value with a threshold,
+    'falling' and 'rising' compare the rate of change in lux per second
+    with a limit. The hysteresis is needed to switch the state back to OFF.
+    """
+    def __init__(self, name, event_type, limit, hysteresis=0.0):
+        """Create light event"""
+        if event_type not in EVENT_ICONS:
+            raise ValueError(f"unknown event type '{event_type}'")
+        if name == "" or any(char in name for char in "/+# "):
+            raise ValueError(f"event name '{name}' can not be used in a topic")
+        if hysteresis < 0:
+            raise ValueError(f"hysteresis {hysteresis} must not be negative")
+        if limit < 0 and event_type in ("falling", "rising"):
+            raise ValueError(f"rate limit {limit} must not be negative")
+        self.name = name
+        self.event_type = event_type
+        self.limit = limit
+        self.hysteresis = hysteresis
+        self.state = None  # None until the first evaluation, than True (ON) or False (OFF)
+        self.last_lux = None  # lux value of the last sample
+        self.last_time = None  # time of the last sample
+
+    def update(self, lux, now):
+        """
+        Evaluate a new lux sample taken at time now (in seconds).
+        Returns True if the state of the event has changed
+        """
+        if self.event_type in ("below", "above"):
+            value = lux if self.event_type == "above" else -lux
+            limit = self.limit if self.event_type == "above" else -self.limit
+        else:
+            if self.last_time is None or now <= self.last_time:
+                # a rate needs two samples
+                self.last_lux, self.last_time = lux, now
+                if self.state is None:
+                    self.state = False
+                    return True
+                return False
+            value = (lux - self.last_lux) / (now - self.last_time)
+            if self.event_type == "falling":
+                value = -value
+            limit = self.limit
+            self.last_lux, self.last_time = lux, now
+
+        if self.state is True:
+            state = value >= limit - self.hysteresis
+        else:
+            state = value >= limit
+        changed = state != self.state
+        self.state = state
+        return changed
+
+    def payload(self):
+        """content of the event topic"""
+        return "ON" if self.state else "OFF"
 
 #
 # main class
@@ -46,6 +118,8 @@ class MqttBH1750Client(BMC.BaseMqttClient): #pylint: disable=too-many-instance-a
 
         #additional class attributes
         self.lux = None  # last published lux value
+        self.bus = None  # smbus of the bh1750
+        self.ready_time = 0  # time when the first measurement of the bh1750 is available
 
     def read_client_config(self, config):
         """
@@ -63,23 +137,76 @@ class MqttBH1750Client(BMC.BaseMqttClient): #pylint: disable=too-many-instance-a
             self.log.error("Error while reading ini file: %s", inst)
             sys.exit()
 
+        # light change events: <name>=<type>,<limit>[,<hysteresis>]
+        self.lux_events = []
+        if "luxEvents" in config:
+            for name, value in config["luxEvents"].items():
+                try:
+                    params = [param.strip() for param in value.split(",")]
+                    if len(params) not in (2, 3):
+                        raise ValueError(value)
+                    self.lux_events.append(
+                        LuxEvent(name, params[0], *[float(param) for param in params[1:]])
+                    )
+                except ValueError as inst:
+                    self.log.error("Error while reading luxEvents '%s' in ini file: %s", name, inst)
+                    sys.exit()
+
+    def warm_up(self):
+        """
+        Open the i2c bus and start the first measurement of the bh1750,
+        so that it runs while the client connects to the broker
+        """
+        import smbus  # pylint: disable=import-outside-toplevel
+
+        my_config = self.topic_config["bh1750"]
+        self.bus = smbus.SMBus(I2C_BUS)
+        try:
+            self.bus.write_byte(my_config["addr"], my_config["mode"])
+        except OSError as error:
+            self.log.error("Can not start measurement of bh1750: %s", error)
+            return
+        if my_config["mode"] in LOW_RES_MODES:
+            self.ready_time = time.monotonic() + MEASUREMENT_TIME_LOW_RES
+        else:
+            self.ready_time = time.monotonic() + MEASUREMENT_TIME
+
     def publish_lux(self, topic, my_config):
         """
         publich lux status
         """
-        bus = smbus.SMBus(1)
-        data = bus.read_i2c_block_data(my_config["addr"], my_config["mode"])
+        if self.bus is None:
+            self.warm_up()
+        # wait until the first measurement is finished
+        delay = self.ready_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        data = self.bus.read_i2c_block_data(my_config["addr"], my_config["mode"])
         lux = (data[1] + (256 * data[0])) / 1.2
+        self.publish_lux_events(f"{topic}/event", lux)
         if self.unpublished is True or self.lux != lux:
-            result = self.client.publish(topic, f"{lux:.4}")
-            # result: [0, 1]
-            status = result[0]
+            status = self.publish(topic, f"{lux:.4}")
             if status == 0:
                 self.log.debug("Send %s to topic %s", lux, topic)
                 self.lux = lux
             else:
                 self.log.error("Failed to send message to topic %s", topic)
 
+    def publish_lux_events(self, topic, lux):
+        """
+        evaluate the light events with the new lux sample and publish
+        changed events immediately. Each event has its own retained topic
+        """
+        now = time.monotonic()
+        for event in self.lux_events:
+            if event.update(lux, now) or self.unpublished is True:
+                event_topic = f"{topic}/{event.name}"
+                status = self.publish(event_topic, event.payload(), retain=True)
+                if status == 0:
+                    self.log.debug("Send %s to topic %s", event.payload(), event_topic)
+                else:
+                    self.log.error("Failed to send message to topic %s", event_topic)
+
     def ha_discover(self):
         """
         piblish all ropics needed for the home assistant mqtt discovery
@@ -93,6 +220,15 @@ class MqttBH1750Client(BMC.BaseMqttClient): #pylint: disable=too-many-instance-a
         )
         self.ha_publish(topic, payload)
 
+        # light change events
+        for event in self.lux_events:
+            topic, payload = self.ha.binary_sensor(
+                "Light event " + event.name,
+                self.topic_root + "/lux/event/" + event.name,
+                icon=EVENT_ICONS[event.event_type],
+            )
+            self.ha_publish(topic, payload)
+
 
 def mqtt_bh1750_client():
     """main function"""
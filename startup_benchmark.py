@@ -0,0 +1,112 @@
+# python
+#
+# This file is part of the mqttBH1750Client distribution
+# (https://github.com/olialb/mqttBH1750Client).
+# Copyright (c) 2025 Oliver Albold.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Measures the startup time of the mqtt client and reports each phase.
+Call it with the same ini file and sensor setup as the service:
+
+    python startup_benchmark.py [ini file]
+"""
+
+import sys
+import time
+
+#
+# global constants
+#
+CONNECT_TIMEOUT = 30  # max. time in seconds to wait for the broker
+
+
+def startup_benchmark(config_file):  # pylint: disable=too-many-locals
+    """run the startup sequence of the client once and print the time of each phase"""
+    phases = []
+    start = time.perf_counter()
+    last = start
+
+    def phase(name):
+        nonlocal last
+        now = time.perf_counter()
+        phases.append((name, now - last))
+        last = now
+
+    import mqtt_bh1750_client as BH  # pylint: disable=import-outside-toplevel
+    phase("import client module")
+
+    client = BH.MqttBH1750Client(config_file)
+    my_config = client.topic_config["bh1750"]
+    lux_topic = f"{client.topic_root}/{my_config['topic']}"
+    phase("read config")
+
+    # on_connect calls subscribe(): use it to record the time of CONNACK and
+    # to catch the message info of the first lux publish
+    connack = []
+    lux_infos = []
+    subscribe = client.subscribe
+
+    def subscribe_wrapper():
+        if not connack:
+            connack.append(time.perf_counter())
+            publish = client.client.publish
+
+            def publish_wrapper(topic, *args, **kwargs):
+                info = publish(topic, *args, **kwargs)
+                if topic == lux_topic:
+                    lux_infos.append(info)
+                return info
+
+            client.client.publish = publish_wrapper
+        subscribe()
+
+    client.subscribe = subscribe_wrapper
+
+    client.connect()
+    phase("start sensor and broker connect")
+
+    client.ha_discover()
+    phase("queue ha discovery")
+
+    client.publish_lux(lux_topic, my_config)
+    if lux_infos:
+        # broker answered during the sensor measurement
+        phase("first reading published")
+        connected = True
+    else:
+        phase("first reading queued")
+        connected = client.connected.wait(CONNECT_TIMEOUT)
+        phase("wait for broker CONNACK")
+
+    if connected and lux_infos:
+        lux_infos[0].wait_for_publish(CONNECT_TIMEOUT)
+        phase("first publish sent")
+
+    # stop without the reconnect handling of the client
+    client.client.on_disconnect = None
+    client.client.disconnect()
+    client.client.loop_stop()
+
+    for name, duration in phases:
+        print(f"{name:<34}{duration * 1000:9.1f} ms")
+    print(f"{'total':<34}{(last - start) * 1000:9.1f} ms")
+    if connack:
+        print(f"{'broker CONNACK after start':<34}{(connack[0] - start) * 1000:9.1f} ms")
+    else:
+        print(f"No connection to broker within {CONNECT_TIMEOUT} seconds!")
+
+
+if __name__ == "__main__":
+    startup_benchmark(sys.argv[1] if len(sys.argv) > 1 else "mqttBH1750Client.ini")